@@ -506,6 +506,7 @@ class RestoreOrchestrator:
                 wait_for_restore=wait_restore,
                 restore_tier=self.config.restore.restore_tier,
                 restore_timeout_seconds=restore_timeout,
+                download_concurrency=self.config.s3.concurrency,
             )
         except RestoreError as exc:
             self.logger.error("event=restore_failed error=%s", exc)
@@ -2,21 +2,62 @@
 
 from __future__ import annotations
 
+import contextlib
+import fcntl
+import functools
 import hashlib
+import heapq
 import json
+import mmap
 import os
 import random
+import re
 import stat
 import subprocess
+import threading
 import time
 import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterable, IO
 
 from btrfs_to_s3.path_utils import ensure_sbin_on_path
 
-ARCHIVAL_STORAGE_CLASSES = {"GLACIER", "DEEP_ARCHIVE", "GLACIER_IR"}
+try:
+    import blake3
+except ModuleNotFoundError:  # pragma: no cover - optional speedup
+    blake3 = None
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import xxhash
+except ModuleNotFoundError:  # pragma: no cover - optional speedup
+    xxhash = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+ARCHIVAL_STORAGE_CLASSES = frozenset({"GLACIER", "DEEP_ARCHIVE", "GLACIER_IR"})
+RANGE_WINDOW_SIZE = 16 * 1024 * 1024
+DEFAULT_DOWNLOAD_CONCURRENCY = 8
+MMAP_HASH_THRESHOLD = 8 * 1024 * 1024
+SERIAL_VERIFY_MAX_FILES = 8
+
+_RESTORE_READY_RE = re.compile(r'ongoing-request="false"', re.IGNORECASE)
+# BTRFS_IOC_GET_SUBVOL_INFO: _IOR(0x94, 60, btrfs_ioctl_get_subvol_info_args)
+_BTRFS_IOC_GET_SUBVOL_INFO = 0x81F8943C
+_SUBVOL_INFO_SIZE = 504
+_SUBVOL_INFO_UUID_OFFSET = 296
+# BTRFS_FIRST_FREE_OBJECTID: the inode number of every subvolume root.
+_BTRFS_SUBVOL_ROOT_INO = 256
+_UUID_LINE_RE = re.compile(
+    r"^[ \t]*uuid:[ \t]*(.*?)[ \t\r]*$", re.IGNORECASE | re.MULTILINE
+)
 
 
 class RestoreError(RuntimeError):
@@ -49,12 +90,7 @@ def needs_restore(storage_class: str | None) -> bool:
 def is_restore_ready(restore_header: str | None) -> bool:
     if not restore_header:
         return False
-    lowered = restore_header.lower()
-    if 'ongoing-request="false"' in lowered:
-        return True
-    if 'ongoing-request="true"' in lowered:
-        return False
-    return False
+    return _RESTORE_READY_RE.search(restore_header) is not None
 
 
 def fetch_current_manifest_key(
@@ -149,10 +185,13 @@ def ensure_chunks_restored(
     timeout_seconds: int,
     sleep: callable = time.sleep,
     time_fn: callable = time.monotonic,
+    head_batch_size: int = 16,
 ) -> None:
     if not needs_restore(storage_class):
         return
-    keys = [chunk.key for chunk in chunks]
+    if head_batch_size <= 0:
+        raise RestoreError("head_batch_size must be positive")
+    keys = list(dict.fromkeys(chunk.key for chunk in chunks))
     for key in keys:
         client.restore_object(
             Bucket=bucket,
@@ -170,16 +209,39 @@ def ensure_chunks_restored(
         if now >= deadline:
             missing = ", ".join(sorted(pending))
             raise RestoreError(f"restore timeout waiting for {missing}")
-        for key in list(pending):
-            response = client.head_object(Bucket=bucket, Key=key)
-            if is_restore_ready(response.get("Restore")):
-                pending.remove(key)
+        pending -= _poll_restored(
+            client, bucket, sorted(pending), head_batch_size
+        )
         if pending:
             jitter = random.random() * 0.1 * delay
             sleep(delay + jitter)
             delay = min(delay * 2.0, 30.0)
 
 
+def _poll_restored(
+    client,
+    bucket: str,
+    keys: list[str],
+    batch_size: int,
+) -> set[str]:
+    if batch_size == 1 or len(keys) == 1:
+        ready = [_head_restore_ready(client, bucket, key) for key in keys]
+    else:
+        workers = min(batch_size, len(keys))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            ready = list(
+                executor.map(
+                    lambda key: _head_restore_ready(client, bucket, key), keys
+                )
+            )
+    return {key for key, is_ready in zip(keys, ready) if is_ready}
+
+
+def _head_restore_ready(client, bucket: str, key: str) -> bool:
+    response = client.head_object(Bucket=bucket, Key=key)
+    return is_restore_ready(response.get("Restore"))
+
+
 def download_and_verify_chunks(
     client,
     bucket: str,
@@ -187,24 +249,38 @@ def download_and_verify_chunks(
     output: IO[bytes],
     *,
     read_size: int = 1024 * 1024,
+    window_size: int = RANGE_WINDOW_SIZE,
+    max_concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY,
 ) -> int:
     if read_size <= 0:
         raise RestoreError("read_size must be positive")
+    if window_size <= 0:
+        raise RestoreError("window_size must be positive")
+    if max_concurrency <= 0:
+        raise RestoreError("max_concurrency must be positive")
     total_bytes = 0
-    for chunk in chunks:
-        response = client.get_object(Bucket=bucket, Key=chunk.key)
-        body = response["Body"]
-        hasher = hashlib.sha256()
-        while True:
-            data = body.read(read_size)
-            if not data:
-                break
-            hasher.update(data)
-            output.write(data)
-            total_bytes += len(data)
-        digest = hasher.hexdigest()
-        if digest != chunk.sha256:
-            raise RestoreError(f"hash mismatch for {chunk.key}")
+    buffer = memoryview(bytearray(read_size))
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        for chunk in chunks:
+            hasher = hashlib.sha256()
+            if chunk.size is not None and chunk.size > window_size:
+                total_bytes += _download_ranged(
+                    executor,
+                    client,
+                    bucket,
+                    chunk,
+                    output,
+                    hasher,
+                    window_size,
+                    max_concurrency,
+                )
+            else:
+                total_bytes += _download_streamed(
+                    client, bucket, chunk, output, hasher, buffer
+                )
+            digest = hasher.hexdigest()
+            if digest != chunk.sha256:
+                raise RestoreError(f"hash mismatch for {chunk.key}")
     return total_bytes
 
 
@@ -217,6 +293,7 @@ def restore_chain(
     wait_for_restore: bool,
     restore_tier: str,
     restore_timeout_seconds: int,
+    download_concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY,
 ) -> int:
     if target.exists():
         raise RestoreError(f"target path already exists: {target}")
@@ -234,7 +311,11 @@ def restore_chain(
                 timeout_seconds=restore_timeout_seconds,
             )
         created, bytes_written = _apply_manifest_stream(
-            client, bucket, manifest, target.parent
+            client,
+            bucket,
+            manifest,
+            target.parent,
+            download_concurrency=download_concurrency,
         )
         total_bytes += bytes_written
         if created != target:
@@ -258,6 +339,8 @@ def verify_metadata(
         raise RestoreError(f"restore target is not a directory: {target}")
     if not os.access(target, os.W_OK):
         raise RestoreError(f"restore target is not writable: {target}")
+    if _is_subvolume_root(target) and _subvolume_uuid(target) is not None:
+        return
     env = os.environ.copy()
     env["PATH"] = ensure_sbin_on_path(env.get("PATH", ""))
     result = runner(
@@ -277,6 +360,8 @@ def verify_content(
     *,
     mode: str,
     sample_max_files: int,
+    workers: int | None = None,
+    cache_path: Path | None = None,
 ) -> None:
     if not source.exists():
         raise RestoreError(f"source snapshot missing: {source}")
@@ -292,40 +377,74 @@ def verify_content(
     if mismatch:
         raise RestoreError(mismatch)
 
-    for rel_path in source_files:
-        source_path = source / rel_path
-        target_path = target / rel_path
-        source_type = _entry_type(source_path)
-        target_type = _entry_type(target_path)
-        if source_type != target_type:
-            raise RestoreError(f"type mismatch for {rel_path}")
-        if source_type == "symlink":
-            if os.readlink(source_path) != os.readlink(target_path):
-                raise RestoreError(f"symlink mismatch for {rel_path}")
-
-    regular_files = [
-        rel_path
-        for rel_path in source_files
-        if _entry_type(source / rel_path) == "file"
-    ]
-    if mode == "full":
-        files_to_check = regular_files
-    elif mode == "sample":
-        files_to_check = _select_sample(regular_files, sample_max_files)
-    elif mode == "none":
-        return
+    if workers is None:
+        workers = min(32, (os.cpu_count() or 1) * 4)
+    if workers <= 0:
+        raise RestoreError("workers must be positive")
+    if len(source_files) <= SERIAL_VERIFY_MAX_FILES:
+        executor_context = contextlib.nullcontext()
     else:
-        raise RestoreError(f"unknown verify mode: {mode}")
-
-    for rel_path in files_to_check:
-        source_path = source / rel_path
-        target_path = target / rel_path
-        source_stat = source_path.stat()
-        target_stat = target_path.stat()
-        if source_stat.st_size != target_stat.st_size:
-            raise RestoreError(f"size mismatch for {rel_path}")
-        if _hash_file(source_path) != _hash_file(target_path):
-            raise RestoreError(f"hash mismatch for {rel_path}")
+        executor_context = ThreadPoolExecutor(max_workers=workers)
+    with executor_context as executor:
+        regular_files = _check_entry_metadata(
+            source, target, source_files, executor, workers
+        )
+        if mode == "full":
+            files_to_check = regular_files
+        elif mode == "sample":
+            files_to_check = _select_sample(regular_files, sample_max_files)
+        elif mode == "none":
+            return
+        else:
+            raise RestoreError(f"unknown verify mode: {mode}")
+
+        cache = (
+            _load_verify_cache(cache_path) if cache_path is not None else None
+        )
+        try:
+            if executor is None:
+                for rel_path in files_to_check:
+                    _verify_file(source, target, rel_path, cache)
+            else:
+                _verify_files_parallel(
+                    executor, source, target, files_to_check, cache, workers
+                )
+        finally:
+            if cache_path is not None and cache is not None:
+                # Only keep entries for files checked this run, so paths from
+                # earlier restores do not pile up in the cache file.
+                touched = {
+                    str(root / rel_path)
+                    for rel_path in files_to_check
+                    for root in (source, target)
+                }
+                _save_verify_cache(
+                    cache_path,
+                    {key: cache[key] for key in touched if key in cache},
+                )
+
+
+def _verify_files_parallel(
+    executor: ThreadPoolExecutor,
+    source: Path,
+    target: Path,
+    rel_paths: list[str],
+    cache: dict[str, Any] | None,
+    workers: int,
+) -> None:
+    in_flight: deque[Future[None]] = deque()
+    try:
+        for rel_path in rel_paths:
+            in_flight.append(
+                executor.submit(_verify_file, source, target, rel_path, cache)
+            )
+            if len(in_flight) >= workers * 2:
+                in_flight.popleft().result()
+        while in_flight:
+            in_flight.popleft().result()
+    finally:
+        for future in in_flight:
+            future.cancel()
 
 
 def verify_restore(
@@ -335,25 +454,95 @@ def verify_restore(
     mode: str,
     sample_max_files: int,
     runner: callable = subprocess.run,
+    workers: int | None = None,
+    cache_path: Path | None = None,
 ) -> None:
     if mode == "none":
         return
     verify_metadata(target, runner=runner)
     if source is None or not source.exists():
         return
+    if os.path.samefile(source, target):
+        return
     verify_content(
         source,
         target,
         mode=mode,
         sample_max_files=sample_max_files,
+        workers=workers,
+        cache_path=cache_path,
     )
 
 
+def _verify_file(
+    source: Path,
+    target: Path,
+    rel_path: str,
+    cache: dict[str, Any] | None = None,
+) -> None:
+    source_path = source / rel_path
+    target_path = target / rel_path
+    source_stat = source_path.stat()
+    target_stat = target_path.stat()
+    if source_stat.st_size != target_stat.st_size:
+        raise RestoreError(f"size mismatch for {rel_path}")
+    source_digest = _cached_hash_file(source_path, source_stat, cache)
+    target_digest = _cached_hash_file(target_path, target_stat, cache)
+    if source_digest != target_digest:
+        raise RestoreError(f"hash mismatch for {rel_path}")
+
+
+def _cached_hash_file(
+    path: Path,
+    file_stat: os.stat_result,
+    cache: dict[str, Any] | None,
+) -> str:
+    if cache is None:
+        return _hash_file(path)
+    # btrfs receive restores mtimes and a replayed stream reuses inode
+    # numbers, so ctime and the device are what tell two restores apart.
+    identity = [
+        file_stat.st_size,
+        file_stat.st_mtime_ns,
+        file_stat.st_ctime_ns,
+        file_stat.st_ino,
+        file_stat.st_dev,
+        _file_hasher_name(),
+    ]
+    key = str(path)
+    entry = cache.get(key)
+    if isinstance(entry, dict) and entry.get("identity") == identity:
+        return entry["digest"]
+    digest = _hash_file(path)
+    cache[key] = {"identity": identity, "digest": digest}
+    return digest
+
+
+def _load_verify_cache(path: Path) -> dict[str, Any]:
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_verify_cache(path: Path, cache: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+    with temp_path.open("w", encoding="utf-8") as handle:
+        json.dump(cache, handle, sort_keys=True)
+        handle.write("\n")
+    temp_path.replace(path)
+
+
 def _apply_manifest_stream(
     client,
     bucket: str,
     manifest: ManifestInfo,
     receive_dir: Path,
+    *,
+    download_concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY,
 ) -> tuple[Path, int]:
     snapshot_path = manifest.snapshot_path
     if not snapshot_path:
@@ -368,7 +557,11 @@ def _apply_manifest_stream(
     stream_error: Exception | None = None
     try:
         bytes_written = download_and_verify_chunks(
-            client, bucket, manifest.chunks, proc.stdin
+            client,
+            bucket,
+            manifest.chunks,
+            proc.stdin,
+            max_concurrency=download_concurrency,
         )
     except Exception as exc:
         stream_error = exc
@@ -406,6 +599,86 @@ def _cleanup_btrfs_receive(
     return stderr.decode("utf-8", errors="replace").strip()
 
 
+def _download_streamed(
+    client,
+    bucket: str,
+    chunk: ChunkInfo,
+    output: IO[bytes],
+    hasher,
+    buffer: memoryview,
+) -> int:
+    response = client.get_object(Bucket=bucket, Key=chunk.key)
+    body = response["Body"]
+    readinto = getattr(body, "readinto", None)
+    written = 0
+    if readinto is not None:
+        while True:
+            count = readinto(buffer)
+            if not count:
+                break
+            data = buffer[:count]
+            hasher.update(data)
+            output.write(data)
+            written += count
+        return written
+    while True:
+        data = body.read(len(buffer))
+        if not data:
+            break
+        hasher.update(data)
+        output.write(data)
+        written += len(data)
+    return written
+
+
+def _download_ranged(
+    executor: ThreadPoolExecutor,
+    client,
+    bucket: str,
+    chunk: ChunkInfo,
+    output: IO[bytes],
+    hasher,
+    window_size: int,
+    max_in_flight: int,
+) -> int:
+    assert chunk.size is not None
+    written = 0
+    in_flight: deque[Future[bytes]] = deque()
+    try:
+        for start in range(0, chunk.size, window_size):
+            end = min(start + window_size, chunk.size) - 1
+            in_flight.append(
+                executor.submit(
+                    _fetch_range, client, bucket, chunk.key, start, end
+                )
+            )
+            if len(in_flight) >= max_in_flight:
+                written += _write_window(in_flight.popleft(), output, hasher)
+        while in_flight:
+            written += _write_window(in_flight.popleft(), output, hasher)
+    finally:
+        for future in in_flight:
+            future.cancel()
+    return written
+
+
+def _fetch_range(client, bucket: str, key: str, start: int, end: int) -> bytes:
+    response = client.get_object(
+        Bucket=bucket, Key=key, Range=f"bytes={start}-{end}"
+    )
+    data = response["Body"].read()
+    if len(data) != end - start + 1:
+        raise RestoreError(f"short read for {key} bytes {start}-{end}")
+    return data
+
+
+def _write_window(future: Future[bytes], output: IO[bytes], hasher) -> int:
+    data = future.result()
+    hasher.update(data)
+    output.write(data)
+    return len(data)
+
+
 def _fetch_json(client, bucket: str, key: str) -> dict[str, Any]:
     try:
         response = client.get_object(Bucket=bucket, Key=key)
@@ -413,8 +686,8 @@ def _fetch_json(client, bucket: str, key: str) -> dict[str, Any]:
         raise RestoreError(f"missing object {key}") from exc
     body = response["Body"].read()
     try:
-        payload = json.loads(body)
-    except json.JSONDecodeError as exc:
+        payload = _json_loads(body)
+    except ValueError as exc:
         raise RestoreError(f"{key} invalid json") from exc
     if not isinstance(payload, dict):
         raise RestoreError(f"{key} must be a JSON object")
@@ -474,11 +747,80 @@ def _check_missing_extra(
     return None
 
 
+def _check_entry_metadata(
+    source: Path,
+    target: Path,
+    rel_paths: list[str],
+    executor: ThreadPoolExecutor | None,
+    workers: int,
+) -> list[str]:
+    regular_files: list[str] = []
+    if executor is None:
+        for rel_path in rel_paths:
+            if _compare_entry(source, target, rel_path):
+                regular_files.append(rel_path)
+        return regular_files
+    in_flight: deque[tuple[str, Future[bool]]] = deque()
+
+    def consume() -> None:
+        rel_path, future = in_flight.popleft()
+        if future.result():
+            regular_files.append(rel_path)
+
+    try:
+        for rel_path in rel_paths:
+            in_flight.append(
+                (
+                    rel_path,
+                    executor.submit(_compare_entry, source, target, rel_path),
+                )
+            )
+            if len(in_flight) >= workers * 2:
+                consume()
+        while in_flight:
+            consume()
+    finally:
+        for _rel_path, future in in_flight:
+            future.cancel()
+    return regular_files
+
+
+def _compare_entry(source: Path, target: Path, rel_path: str) -> bool:
+    source_type, source_size, source_link = _entry_metadata(source, rel_path)
+    target_type, target_size, target_link = _entry_metadata(target, rel_path)
+    if source_type != target_type:
+        raise RestoreError(f"type mismatch for {rel_path}")
+    if source_type == "symlink" and source_link != target_link:
+        raise RestoreError(f"symlink mismatch for {rel_path}")
+    if source_type != "file":
+        return False
+    if source_size != target_size:
+        raise RestoreError(f"size mismatch for {rel_path}")
+    return True
+
+
+def _entry_metadata(
+    base_path: Path, rel_path: str
+) -> tuple[str, int, str | None]:
+    path = base_path / rel_path
+    try:
+        file_stat = path.lstat()
+    except FileNotFoundError:
+        return "missing", 0, None
+    entry_type = _mode_type(file_stat.st_mode)
+    link = os.readlink(path) if entry_type == "symlink" else None
+    return entry_type, file_stat.st_size, link
+
+
 def _entry_type(path: Path) -> str:
     try:
         mode = path.lstat().st_mode
     except FileNotFoundError:
         return "missing"
+    return _mode_type(mode)
+
+
+def _mode_type(mode: int) -> str:
     if stat.S_ISLNK(mode):
         return "symlink"
     if stat.S_ISREG(mode):
@@ -515,30 +857,123 @@ def _set_subvolume_writable(path: Path) -> None:
 def _select_sample(paths: list[str], sample_max_files: int) -> list[str]:
     if sample_max_files <= 0:
         return []
-    ordered = sorted(paths)
-    if len(ordered) <= sample_max_files:
-        return ordered
-    return ordered[:sample_max_files]
+    return heapq.nsmallest(sample_max_files, paths)
+
+
+def _new_file_hasher():
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    if blake3 is not None:
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    return hashlib.sha256()
+
+
+@functools.lru_cache(maxsize=None)
+def _file_hasher_name() -> str:
+    return _new_file_hasher().name
+
+
+_hasher_local = threading.local()
+
+
+def _reusable_file_hasher():
+    # xxhash and blake3 hashers expose reset(); hashlib ones do not.
+    hasher = getattr(_hasher_local, "hasher", None)
+    if hasher is not None:
+        hasher.reset()
+        return hasher
+    hasher = _new_file_hasher()
+    if hasattr(hasher, "reset"):
+        _hasher_local.hasher = hasher
+    return hasher
+
+
+def _scratch_buffer(size: int) -> memoryview:
+    buffer = getattr(_hasher_local, "buffer", None)
+    if buffer is None or len(buffer) != size:
+        buffer = memoryview(bytearray(size))
+        _hasher_local.buffer = buffer
+    return buffer
 
 
 def _hash_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
-    hasher = hashlib.sha256()
-    with path.open("rb") as handle:
-        while True:
-            chunk = handle.read(chunk_size)
-            if not chunk:
-                break
-            hasher.update(chunk)
+    hasher = _reusable_file_hasher()
+    fd = _open_for_hashing(path)
+    with os.fdopen(fd, "rb", buffering=0) as handle:
+        _fadvise(fd, "POSIX_FADV_SEQUENTIAL")
+        try:
+            size = os.fstat(fd).st_size
+            if 0 < size <= MMAP_HASH_THRESHOLD:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+                    if hasattr(mapped, "madvise"):
+                        mapped.madvise(
+                            getattr(mmap, "MADV_SEQUENTIAL", mmap.MADV_NORMAL)
+                        )
+                    with memoryview(mapped) as view:
+                        hasher.update(view)
+                return hasher.hexdigest()
+            buffer = _scratch_buffer(chunk_size)
+            while True:
+                count = handle.readinto(buffer)
+                if not count:
+                    break
+                hasher.update(buffer[:count])
+        finally:
+            _fadvise(fd, "POSIX_FADV_DONTNEED")
     return hasher.hexdigest()
 
 
+def _open_for_hashing(path: Path) -> int:
+    noatime = getattr(os, "O_NOATIME", 0)
+    if noatime:
+        try:
+            return os.open(path, os.O_RDONLY | noatime)
+        except PermissionError:
+            pass
+    return os.open(path, os.O_RDONLY)
+
+
+def _fadvise(fd: int, advice: str) -> None:
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+    except OSError:
+        pass
+
+
+def _is_subvolume_root(path: Path) -> bool:
+    # GET_SUBVOL_INFO answers for any inode inside a subvolume, so only
+    # trust it for the subvolume root itself.
+    return os.stat(path).st_ino == _BTRFS_SUBVOL_ROOT_INO
+
+
+def _subvolume_uuid(path: Path) -> str | None:
+    buffer = bytearray(_SUBVOL_INFO_SIZE)
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return None
+    try:
+        fcntl.ioctl(fd, _BTRFS_IOC_GET_SUBVOL_INFO, buffer)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    offset = _SUBVOL_INFO_UUID_OFFSET
+    value = uuid.UUID(bytes=bytes(buffer[offset : offset + 16]))
+    if value.int == 0:
+        return None
+    return str(value)
+
+
 def _parse_uuid(output: str) -> str | None:
-    for line in output.splitlines():
-        if line.strip().lower().startswith("uuid:"):
-            value = line.split(":", 1)[1].strip()
-            try:
-                uuid.UUID(value)
-            except ValueError:
-                return None
-            return value
-    return None
+    match = _UUID_LINE_RE.search(output)
+    if match is None:
+        return None
+    value = match.group(1)
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return None
+    return value
@@ -34,10 +34,12 @@ class SnapshotManager:
         base_dir: Path,
         runner: CommandRunner,
         now: Callable[[], datetime] | None = None,
+        lister: Callable[[Path], Iterable[Path]] | None = None,
     ) -> None:
         self.base_dir = base_dir
         self.runner = runner
         self.now = now or (lambda: datetime.now(timezone.utc))
+        self.lister = lister or _list_dir
 
     def create_snapshot(
         self, subvolume_path: Path, subvolume_name: str, kind: str
@@ -59,10 +61,8 @@ class SnapshotManager:
         return Snapshot(name=name, path=path, kind=kind, created_at=timestamp)
 
     def list_snapshots(self, subvolume_name: str) -> list[Snapshot]:
-        if not self.base_dir.exists():
-            return []
         snapshots: list[Snapshot] = []
-        for entry in self.base_dir.iterdir():
+        for entry in self.lister(self.base_dir):
             parsed = parse_snapshot_name(entry.name)
             if parsed is None:
                 continue
@@ -99,6 +99,12 @@ class SnapshotManager:
         return deleted
 
 
+def _list_dir(path: Path) -> Iterable[Path]:
+    if not path.exists():
+        return []
+    return path.iterdir()
+
+
 def snapshot_name(subvolume_name: str, created_at: datetime, kind: str) -> str:
     if created_at.tzinfo is None:
         raise SnapshotError("created_at must be timezone-aware")
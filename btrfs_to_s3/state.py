@@ -5,7 +5,7 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 
 @dataclass(frozen=True)
@@ -57,14 +57,21 @@ def load_state(path: Path) -> State:
     if not path.exists():
         return State()
     with path.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
-    return State.from_dict(data)
+        return read_state(handle)
 
 
 def save_state(path: Path, state: State) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     temp_path = path.with_suffix(".tmp")
     with temp_path.open("w", encoding="utf-8") as handle:
-        json.dump(state.to_dict(), handle, indent=2, sort_keys=True)
-        handle.write("\n")
+        write_state(handle, state)
     temp_path.replace(path)
+
+
+def read_state(handle: TextIO) -> State:
+    return State.from_dict(json.load(handle))
+
+
+def write_state(handle: TextIO, state: State) -> None:
+    json.dump(state.to_dict(), handle, indent=2, sort_keys=True)
+    handle.write("\n")
@@ -57,92 +57,81 @@ def make_config() -> Config:
     )
 
 
-class PlannerTests(unittest.TestCase):
-    def test_full_due(self) -> None:
-        config = make_config()
-        state = State(
-            subvolumes={
-                "data": SubvolumeState(last_full_at="2024-01-01T00:00:00Z")
-            }
-        )
-        now = datetime(2026, 1, 1, tzinfo=timezone.utc)
-        plan = plan_backups(config, state, now)
-        self.assertEqual(plan[0].action, "full")
-
-    def test_incremental_due(self) -> None:
-        config = make_config()
-        state = State(
-            subvolumes={
-                "data": SubvolumeState(
-                    last_full_at="2025-12-15T00:00:00Z",
-                    last_snapshot="data__20260101T000000Z__inc",
-                    last_manifest="backup/data/subvol/data/incremental/manifest-20260101T000000Z.json",
-                )
-            }
-        )
-        now = datetime(2026, 1, 10, tzinfo=timezone.utc)
-        plan = plan_backups(
-            config,
-            state,
-            now,
-            available_snapshots={"data__20260101T000000Z__inc"},
-        )
-        self.assertEqual(plan[0].action, "inc")
-        self.assertEqual(plan[0].parent_snapshot, "data__20260101T000000Z__inc")
+PLAN_CASES = (
+    (
+        "full_due",
+        SubvolumeState(last_full_at="2024-01-01T00:00:00Z"),
+        datetime(2026, 1, 1, tzinfo=timezone.utc),
+        None,
+        "full",
+        None,
+    ),
+    (
+        "incremental_due",
+        SubvolumeState(
+            last_full_at="2025-12-15T00:00:00Z",
+            last_snapshot="data__20260101T000000Z__inc",
+            last_manifest="backup/data/subvol/data/incremental/manifest-20260101T000000Z.json",
+        ),
+        datetime(2026, 1, 10, tzinfo=timezone.utc),
+        {"data__20260101T000000Z__inc"},
+        "inc",
+        "data__20260101T000000Z__inc",
+    ),
+    (
+        "missing_parent_falls_back_to_full",
+        SubvolumeState(
+            last_full_at="2025-12-15T00:00:00Z",
+            last_snapshot="data__20260101T000000Z__inc",
+        ),
+        datetime(2026, 1, 10, tzinfo=timezone.utc),
+        set(),
+        "full",
+        None,
+    ),
+    (
+        "missing_manifest_falls_back_to_full",
+        SubvolumeState(
+            last_full_at="2025-12-15T00:00:00Z",
+            last_snapshot="data__20260101T000000Z__inc",
+            last_manifest=None,
+        ),
+        datetime(2026, 1, 10, tzinfo=timezone.utc),
+        {"data__20260101T000000Z__inc"},
+        "full",
+        None,
+    ),
+    (
+        "incremental_not_due_skips",
+        SubvolumeState(
+            last_full_at="2025-12-15T00:00:00Z",
+            last_snapshot="data__20260105T000000Z__inc",
+            last_manifest="backup/data/subvol/data/incremental/manifest-20260105T000000Z.json",
+        ),
+        datetime(2026, 1, 8, tzinfo=timezone.utc),
+        {"data__20260105T000000Z__inc"},
+        "skip",
+        "data__20260105T000000Z__inc",
+    ),
+)
 
-    def test_missing_parent_falls_back_to_full(self) -> None:
-        config = make_config()
-        state = State(
-            subvolumes={
-                "data": SubvolumeState(
-                    last_full_at="2025-12-15T00:00:00Z",
-                    last_snapshot="data__20260101T000000Z__inc",
-                )
-            }
-        )
-        now = datetime(2026, 1, 10, tzinfo=timezone.utc)
-        plan = plan_backups(config, state, now, available_snapshots=set())
-        self.assertEqual(plan[0].action, "full")
 
-    def test_missing_manifest_falls_back_to_full(self) -> None:
-        config = make_config()
-        state = State(
-            subvolumes={
-                "data": SubvolumeState(
-                    last_full_at="2025-12-15T00:00:00Z",
-                    last_snapshot="data__20260101T000000Z__inc",
-                    last_manifest=None,
-                )
-            }
-        )
-        now = datetime(2026, 1, 10, tzinfo=timezone.utc)
-        plan = plan_backups(
-            config,
-            state,
-            now,
-            available_snapshots={"data__20260101T000000Z__inc"},
-        )
-        self.assertEqual(plan[0].action, "full")
+class PlannerTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.config = make_config()
 
-    def test_incremental_not_due_skips(self) -> None:
-        config = make_config()
-        state = State(
-            subvolumes={
-                "data": SubvolumeState(
-                    last_full_at="2025-12-15T00:00:00Z",
-                    last_snapshot="data__20260105T000000Z__inc",
-                    last_manifest="backup/data/subvol/data/incremental/manifest-20260105T000000Z.json",
+    def test_plan_actions(self) -> None:
+        for name, sub_state, now, available, action, parent in PLAN_CASES:
+            with self.subTest(case=name):
+                plan = plan_backups(
+                    self.config,
+                    State(subvolumes={"data": sub_state}),
+                    now,
+                    available_snapshots=available,
                 )
-            }
-        )
-        now = datetime(2026, 1, 8, tzinfo=timezone.utc)
-        plan = plan_backups(
-            config,
-            state,
-            now,
-            available_snapshots={"data__20260105T000000Z__inc"},
-        )
-        self.assertEqual(plan[0].action, "skip")
+                self.assertEqual(plan[0].action, action)
+                self.assertEqual(plan[0].parent_snapshot, parent)
 
 
 if __name__ == "__main__":
@@ -8,8 +8,12 @@ import json
 import os
 import subprocess
 import tempfile
+import threading
 import unittest
+import uuid
+from collections import deque
 from pathlib import Path
+from types import SimpleNamespace
 from unittest import mock
 
 from btrfs_to_s3 import restore
@@ -17,41 +21,62 @@ from btrfs_to_s3 import restore
 
 class FakeBody:
     def __init__(self, payload: bytes) -> None:
-        self._payload = payload
+        self._view = memoryview(payload)
         self._offset = 0
 
-    def read(self, size: int | None = None) -> bytes:
+    def read(self, size: int | None = None) -> bytes | memoryview:
         if size is None:
-            size = len(self._payload) - self._offset
+            data = self._view[self._offset :].tobytes()
+            self._offset = len(self._view)
+            return data
         if size < 0:
             return b""
         start = self._offset
-        end = min(len(self._payload), start + size)
+        end = min(len(self._view), start + size)
         self._offset = end
-        return self._payload[start:end]
+        return self._view[start:end]
+
+    def readinto(self, buffer: memoryview) -> int:
+        start = self._offset
+        end = min(len(self._view), start + len(buffer))
+        buffer[: end - start] = self._view[start:end]
+        self._offset = end
+        return end - start
 
 
 class FakeS3:
     def __init__(self) -> None:
         self.objects: dict[str, bytes] = {}
         self.restore_requests: list[str] = []
-        self.restore_headers: dict[str, list[str | None]] = {}
+        self.restore_headers: dict[str, deque[str | None]] = {}
+        self.head_calls: dict[str, int] = {}
+        self.range_requests: list[tuple[str, str]] = []
 
-    def get_object(self, Bucket: str, Key: str) -> dict[str, object]:
+    def get_object(
+        self, Bucket: str, Key: str, Range: str | None = None
+    ) -> dict[str, object]:
         if Key not in self.objects:
             raise KeyError(Key)
         payload = self.objects[Key]
-        if isinstance(payload, FakeBody):
+        if not isinstance(payload, bytes):
             return {"Body": payload}
+        if Range is not None:
+            self.range_requests.append((Key, Range))
+            start, end = Range.removeprefix("bytes=").split("-")
+            return {"Body": FakeBody(payload[int(start) : int(end) + 1])}
         return {"Body": FakeBody(payload)}
 
     def head_object(self, Bucket: str, Key: str) -> dict[str, object]:
         if Key not in self.objects:
             raise KeyError(Key)
-        headers = self.restore_headers.get(Key, [None])
-        header = headers[0]
-        if len(headers) > 1:
-            headers.pop(0)
+        self.head_calls[Key] = self.head_calls.get(Key, 0) + 1
+        headers = self.restore_headers.get(Key)
+        if not headers:
+            header = None
+        elif len(headers) > 1:
+            header = headers.popleft()
+        else:
+            header = headers[0]
         return {"Restore": header}
 
     def restore_object(self, Bucket: str, Key: str, RestoreRequest: dict) -> None:
@@ -133,11 +158,12 @@ class RestoreTests(unittest.TestCase):
         self.assertTrue(restore.is_restore_ready(header_ready))
         self.assertFalse(restore.is_restore_ready(header_pending))
         self.assertFalse(restore.is_restore_ready(None))
+        self.assertTrue(restore.is_restore_ready('Ongoing-Request="FALSE"'))
 
     def test_restore_timeout_raises(self) -> None:
         client = FakeS3()
         client.objects["chunk.bin"] = b"payload"
-        client.restore_headers["chunk.bin"] = ['ongoing-request="true"']
+        client.restore_headers["chunk.bin"] = deque(['ongoing-request="true"'])
         chunk = restore.ChunkInfo(key="chunk.bin", sha256="x", size=None)
 
         time_state = {"now": 0.0}
@@ -224,6 +250,11 @@ class RestoreTests(unittest.TestCase):
             restore._fetch_json(client, "bucket", "bad.json")
         self.assertIn("invalid json", str(context.exception))
 
+        client.objects["binary.json"] = b"\xff\xfe"
+        with self.assertRaises(restore.RestoreError) as context:
+            restore._fetch_json(client, "bucket", "binary.json")
+        self.assertIn("invalid json", str(context.exception))
+
         client.objects["list.json"] = json.dumps([1, 2, 3]).encode("utf-8")
         with self.assertRaises(restore.RestoreError) as context:
             restore._fetch_json(client, "bucket", "list.json")
@@ -310,9 +341,9 @@ class RestoreTests(unittest.TestCase):
                 super().__init__(payload)
                 self.read_sizes: list[int | None] = []
 
-            def read(self, size: int | None = None) -> bytes:
-                self.read_sizes.append(size)
-                return super().read(size)
+            def readinto(self, buffer: memoryview) -> int:
+                self.read_sizes.append(len(buffer))
+                return super().readinto(buffer)
 
         payload = b"streamed-payload"
         body = RecordingBody(payload)
@@ -338,6 +369,159 @@ class RestoreTests(unittest.TestCase):
         self.assertTrue(all(size == 4 for size in body.read_sizes))
         self.assertGreater(len(body.read_sizes), 2)
 
+    def test_download_falls_back_to_read(self) -> None:
+        class ReadOnlyBody:
+            def __init__(self, payload: bytes) -> None:
+                self._body = FakeBody(payload)
+
+            def read(self, size: int | None = None) -> bytes | memoryview:
+                return self._body.read(size)
+
+        payload = b"read-only-payload"
+        client = FakeS3()
+        client.objects["chunk.bin"] = ReadOnlyBody(payload)
+        chunk = restore.ChunkInfo(
+            key="chunk.bin",
+            sha256=hashlib.sha256(payload).hexdigest(),
+            size=None,
+        )
+        output = io.BytesIO()
+
+        restore.download_and_verify_chunks(
+            client, "bucket", [chunk], output, read_size=5
+        )
+
+        self.assertEqual(output.getvalue(), payload)
+
+    def test_download_prefers_readinto(self) -> None:
+        class ReadintoBody(FakeBody):
+            def __init__(self, payload: bytes) -> None:
+                super().__init__(payload)
+                self.readinto_calls = 0
+
+            def readinto(self, buffer: memoryview) -> int:
+                self.readinto_calls += 1
+                return super().readinto(buffer)
+
+        payload = os.urandom(1024 * 1024 + 7)
+        body = ReadintoBody(payload)
+        client = FakeS3()
+        client.objects["chunk.bin"] = body
+        chunk = restore.ChunkInfo(
+            key="chunk.bin",
+            sha256=hashlib.sha256(payload).hexdigest(),
+            size=None,
+        )
+        output = io.BytesIO()
+
+        total_bytes = restore.download_and_verify_chunks(
+            client, "bucket", [chunk], output, read_size=64 * 1024
+        )
+
+        self.assertEqual(output.getvalue(), payload)
+        self.assertEqual(total_bytes, len(payload))
+        self.assertEqual(body.readinto_calls, 18)
+
+    def test_download_reuses_read_buffer_across_chunks(self) -> None:
+        class BufferRecordingBody(FakeBody):
+            def __init__(self, payload: bytes) -> None:
+                super().__init__(payload)
+                self.buffers: list[object] = []
+
+            def readinto(self, buffer: memoryview) -> int:
+                self.buffers.append(buffer.obj)
+                return super().readinto(buffer)
+
+        client = FakeS3()
+        bodies = []
+        chunks = []
+        for index in range(3):
+            payload = f"chunk-{index}".encode()
+            body = BufferRecordingBody(payload)
+            bodies.append(body)
+            client.objects[f"chunk-{index}.bin"] = body
+            chunks.append(
+                restore.ChunkInfo(
+                    key=f"chunk-{index}.bin",
+                    sha256=hashlib.sha256(payload).hexdigest(),
+                    size=len(payload),
+                )
+            )
+        output = io.BytesIO()
+
+        restore.download_and_verify_chunks(
+            client, "bucket", chunks, output, read_size=4
+        )
+
+        self.assertEqual(output.getvalue(), b"chunk-0chunk-1chunk-2")
+        buffers = {id(buffer) for body in bodies for buffer in body.buffers}
+        self.assertEqual(len(buffers), 1)
+
+    def test_download_fetches_large_chunks_in_range_windows(self) -> None:
+        payload = b"0123456789"
+        client = FakeS3()
+        client.objects["chunk.bin"] = payload
+        chunk = restore.ChunkInfo(
+            key="chunk.bin",
+            sha256=hashlib.sha256(payload).hexdigest(),
+            size=len(payload),
+        )
+        output = io.BytesIO()
+
+        total_bytes = restore.download_and_verify_chunks(
+            client, "bucket", [chunk], output, window_size=4
+        )
+
+        self.assertEqual(output.getvalue(), payload)
+        self.assertEqual(total_bytes, len(payload))
+        self.assertEqual(
+            sorted(client.range_requests),
+            [
+                ("chunk.bin", "bytes=0-3"),
+                ("chunk.bin", "bytes=4-7"),
+                ("chunk.bin", "bytes=8-9"),
+            ],
+        )
+
+    def test_download_concurrent_windows_preserve_order(self) -> None:
+        payloads = [b"first-chunk-payload", b"second-chunk-payload"]
+        client = FakeS3()
+        chunks = []
+        for index, payload in enumerate(payloads):
+            key = f"chunk-{index}.bin"
+            client.objects[key] = payload
+            chunks.append(
+                restore.ChunkInfo(
+                    key=key,
+                    sha256=hashlib.sha256(payload).hexdigest(),
+                    size=len(payload),
+                )
+            )
+        output = io.BytesIO()
+
+        total_bytes = restore.download_and_verify_chunks(
+            client,
+            "bucket",
+            chunks,
+            output,
+            window_size=3,
+            max_concurrency=4,
+        )
+
+        self.assertEqual(output.getvalue(), b"".join(payloads))
+        self.assertEqual(total_bytes, sum(len(item) for item in payloads))
+
+    def test_download_range_short_read_raises(self) -> None:
+        client = FakeS3()
+        client.objects["chunk.bin"] = b"short"
+        chunk = restore.ChunkInfo(key="chunk.bin", sha256="x", size=10)
+
+        with self.assertRaises(restore.RestoreError) as context:
+            restore.download_and_verify_chunks(
+                client, "bucket", [chunk], io.BytesIO(), window_size=4
+            )
+        self.assertIn("short read", str(context.exception))
+
     def test_download_requires_positive_read_size(self) -> None:
         client = FakeS3()
         client.objects["chunk.bin"] = b"payload"
@@ -352,6 +536,12 @@ class RestoreTests(unittest.TestCase):
             )
         self.assertIn("read_size", str(context.exception))
 
+        with self.assertRaises(restore.RestoreError) as context:
+            restore.download_and_verify_chunks(
+                client, "bucket", [chunk], io.BytesIO(), max_concurrency=0
+            )
+        self.assertIn("max_concurrency", str(context.exception))
+
     def test_ensure_chunks_restored_noop_for_standard(self) -> None:
         client = FakeS3()
         client.objects["chunk.bin"] = b"payload"
@@ -371,7 +561,7 @@ class RestoreTests(unittest.TestCase):
     def test_ensure_chunks_restored_clears_pending(self) -> None:
         client = FakeS3()
         client.objects["chunk.bin"] = b"payload"
-        client.restore_headers["chunk.bin"] = ['ongoing-request="false"']
+        client.restore_headers["chunk.bin"] = deque(['ongoing-request="false"'])
         chunk = restore.ChunkInfo(key="chunk.bin", sha256="x", size=None)
 
         restore.ensure_chunks_restored(
@@ -387,6 +577,72 @@ class RestoreTests(unittest.TestCase):
 
         self.assertEqual(client.restore_requests, ["chunk.bin"])
 
+    def test_ensure_chunks_restored_polls_only_pending(self) -> None:
+        client = FakeS3()
+        client.objects["a.bin"] = b"a"
+        client.objects["b.bin"] = b"b"
+        client.restore_headers["a.bin"] = deque(
+            ['ongoing-request="true"', 'ongoing-request="false"']
+        )
+        client.restore_headers["b.bin"] = deque(
+            [
+                'ongoing-request="true"',
+                'ongoing-request="true"',
+                'ongoing-request="false"',
+            ]
+        )
+        chunks = [
+            restore.ChunkInfo(key="a.bin", sha256="x", size=None),
+            restore.ChunkInfo(key="a.bin", sha256="x", size=None),
+            restore.ChunkInfo(key="b.bin", sha256="y", size=None),
+        ]
+        sleeps: list[float] = []
+
+        restore.ensure_chunks_restored(
+            client,
+            "bucket",
+            chunks,
+            storage_class="GLACIER",
+            restore_tier="Standard",
+            timeout_seconds=60,
+            sleep=sleeps.append,
+            time_fn=lambda: 0.0,
+        )
+
+        self.assertEqual(client.restore_requests, ["a.bin", "b.bin"])
+        self.assertEqual(client.head_calls, {"a.bin": 2, "b.bin": 3})
+        self.assertEqual(len(sleeps), 2)
+
+    def test_ensure_chunks_restored_batches_head_polls(self) -> None:
+        client = FakeS3()
+        chunks = []
+        for index in range(5):
+            key = f"chunk-{index}.bin"
+            client.objects[key] = b"payload"
+            chunks.append(restore.ChunkInfo(key=key, sha256="x", size=None))
+
+        for batch_size in (1, 4):
+            with self.subTest(head_batch_size=batch_size):
+                for key in client.objects:
+                    client.restore_headers[key] = deque(
+                        ['ongoing-request="true"', 'ongoing-request="false"']
+                    )
+                client.head_calls.clear()
+                restore.ensure_chunks_restored(
+                    client,
+                    "bucket",
+                    chunks,
+                    storage_class="GLACIER",
+                    restore_tier="Standard",
+                    timeout_seconds=60,
+                    sleep=lambda _: None,
+                    time_fn=lambda: 0.0,
+                    head_batch_size=batch_size,
+                )
+                self.assertEqual(
+                    client.head_calls, {chunk.key: 2 for chunk in chunks}
+                )
+
     def test_stream_failure_cleans_up_receive(self) -> None:
         client = FakeS3()
         manifest = restore.ManifestInfo(
@@ -780,7 +1036,11 @@ class RestoreVerifyTests(unittest.TestCase):
                     stderr="",
                 )
 
-            with mock.patch.dict(os.environ, {"PATH": "/bin"}):
+            with mock.patch.dict(
+                os.environ, {"PATH": "/bin"}
+            ), mock.patch(
+                "btrfs_to_s3.restore._subvolume_uuid", return_value=None
+            ):
                 restore.verify_metadata(target_path, runner=runner)
         self.assertIn("/usr/sbin", captured["path"])
         self.assertIn("/sbin", captured["path"])
@@ -823,7 +1083,52 @@ class RestoreVerifyTests(unittest.TestCase):
                     stderr="",
                 )
 
-            restore.verify_metadata(target_path, runner=runner)
+            with mock.patch(
+                "btrfs_to_s3.restore._subvolume_uuid", return_value=None
+            ):
+                restore.verify_metadata(target_path, runner=runner)
+
+    def test_verify_metadata_prefers_subvol_info_ioctl(self) -> None:
+        value = uuid.UUID("11111111-2222-3333-4444-555555555555")
+
+        def fake_ioctl(fd, request, buffer):
+            self.assertEqual(request, restore._BTRFS_IOC_GET_SUBVOL_INFO)
+            offset = restore._SUBVOL_INFO_UUID_OFFSET
+            buffer[offset : offset + 16] = value.bytes
+            return 0
+
+        with tempfile.TemporaryDirectory() as target_dir:
+            target_path = Path(target_dir)
+            runner = mock.Mock()
+            with mock.patch(
+                "btrfs_to_s3.restore.fcntl.ioctl", side_effect=fake_ioctl
+            ), mock.patch(
+                "btrfs_to_s3.restore._is_subvolume_root", return_value=True
+            ):
+                self.assertEqual(
+                    restore._subvolume_uuid(target_path), str(value)
+                )
+                restore.verify_metadata(target_path, runner=runner)
+            runner.assert_not_called()
+
+    def test_verify_metadata_plain_directory_uses_runner(self) -> None:
+        with tempfile.TemporaryDirectory() as target_dir:
+            target_path = Path(target_dir)
+            runner = mock.Mock(
+                return_value=subprocess.CompletedProcess(
+                    [], 0, stdout="UUID: not-a-uuid\n", stderr=""
+                )
+            )
+            with mock.patch(
+                "btrfs_to_s3.restore._is_subvolume_root", return_value=False
+            ), mock.patch(
+                "btrfs_to_s3.restore._subvolume_uuid",
+                return_value="11111111-2222-3333-4444-555555555555",
+            ) as subvolume_uuid:
+                with self.assertRaises(restore.RestoreError):
+                    restore.verify_metadata(target_path, runner=runner)
+            subvolume_uuid.assert_not_called()
+            runner.assert_called_once()
 
     def test_verify_metadata_invalid_uuid(self) -> None:
         with tempfile.TemporaryDirectory() as target_dir:
@@ -837,7 +1142,9 @@ class RestoreVerifyTests(unittest.TestCase):
                     stderr="",
                 )
 
-            with self.assertRaises(restore.RestoreError) as context:
+            with mock.patch(
+                "btrfs_to_s3.restore._subvolume_uuid", return_value=None
+            ), self.assertRaises(restore.RestoreError) as context:
                 restore.verify_metadata(target_path, runner=runner)
             self.assertIn("UUID", str(context.exception))
 
@@ -947,6 +1254,28 @@ class RestoreVerifyTests(unittest.TestCase):
                     )
                 self.assertIn("size mismatch", str(context.exception))
 
+    def test_verify_content_size_mismatch_skips_hashing(self) -> None:
+        with tempfile.TemporaryDirectory() as source_dir:
+            with tempfile.TemporaryDirectory() as target_dir:
+                for name in ("a.txt", "b.txt"):
+                    Path(source_dir, name).write_text("data", encoding="utf-8")
+                Path(target_dir, "a.txt").write_text("data", encoding="utf-8")
+                Path(target_dir, "b.txt").write_text("longer", encoding="utf-8")
+                with mock.patch(
+                    "btrfs_to_s3.restore._hash_file"
+                ) as hash_file:
+                    with self.assertRaises(restore.RestoreError) as context:
+                        restore.verify_content(
+                            Path(source_dir),
+                            Path(target_dir),
+                            mode="full",
+                            sample_max_files=10,
+                        )
+                self.assertEqual(
+                    str(context.exception), "size mismatch for b.txt"
+                )
+                hash_file.assert_not_called()
+
     def test_verify_content_modes(self) -> None:
         with tempfile.TemporaryDirectory() as source_dir:
             with tempfile.TemporaryDirectory() as target_dir:
@@ -973,6 +1302,145 @@ class RestoreVerifyTests(unittest.TestCase):
                     )
                 self.assertIn("unknown verify mode", str(context.exception))
 
+    def test_verify_content_parallel_reports_first_mismatch(self) -> None:
+        with tempfile.TemporaryDirectory() as source_dir:
+            with tempfile.TemporaryDirectory() as target_dir:
+                for index in range(20):
+                    name = f"file-{index:02d}.txt"
+                    Path(source_dir, name).write_text("data", encoding="utf-8")
+                    content = "tada" if index in (7, 15) else "data"
+                    Path(target_dir, name).write_text(content, encoding="utf-8")
+                with self.assertRaises(restore.RestoreError) as context:
+                    restore.verify_content(
+                        Path(source_dir),
+                        Path(target_dir),
+                        mode="full",
+                        sample_max_files=10,
+                        workers=4,
+                    )
+                self.assertEqual(
+                    str(context.exception), "hash mismatch for file-07.txt"
+                )
+
+    def test_entry_metadata_scan_bounds_pending_tasks(self) -> None:
+        pending: list[int] = [0]
+        peak: list[int] = [0]
+
+        class LazyFuture:
+            def __init__(self, fn, args) -> None:
+                self._fn = fn
+                self._args = args
+
+            def result(self):
+                pending[0] -= 1
+                return self._fn(*self._args)
+
+            def cancel(self) -> bool:
+                return True
+
+        class LazyExecutor:
+            def submit(self, fn, *args):
+                pending[0] += 1
+                peak[0] = max(peak[0], pending[0])
+                return LazyFuture(fn, args)
+
+        with tempfile.TemporaryDirectory() as source_dir:
+            with tempfile.TemporaryDirectory() as target_dir:
+                names = [f"file-{index:02d}.txt" for index in range(40)]
+                for name in names:
+                    Path(source_dir, name).write_text("data", encoding="utf-8")
+                    Path(target_dir, name).write_text("data", encoding="utf-8")
+                regular_files = restore._check_entry_metadata(
+                    Path(source_dir),
+                    Path(target_dir),
+                    names,
+                    LazyExecutor(),
+                    workers=3,
+                )
+        self.assertEqual(regular_files, names)
+        self.assertLessEqual(peak[0], 6)
+
+    def test_verify_content_small_tree_runs_serially(self) -> None:
+        with tempfile.TemporaryDirectory() as source_dir:
+            with tempfile.TemporaryDirectory() as target_dir:
+                for index in range(restore.SERIAL_VERIFY_MAX_FILES):
+                    name = f"file-{index}.txt"
+                    Path(source_dir, name).write_text("data", encoding="utf-8")
+                    Path(target_dir, name).write_text("data", encoding="utf-8")
+                with mock.patch(
+                    "btrfs_to_s3.restore.ThreadPoolExecutor"
+                ) as executor:
+                    restore.verify_content(
+                        Path(source_dir),
+                        Path(target_dir),
+                        mode="full",
+                        sample_max_files=10,
+                    )
+                executor.assert_not_called()
+
+    def test_verify_content_cache_skips_rehash(self) -> None:
+        with tempfile.TemporaryDirectory() as source_dir:
+            with tempfile.TemporaryDirectory() as target_dir:
+                Path(source_dir, "file.txt").write_text("data", encoding="utf-8")
+                Path(target_dir, "file.txt").write_text("data", encoding="utf-8")
+                cache_dir = tempfile.TemporaryDirectory()
+                self.addCleanup(cache_dir.cleanup)
+                cache_path = Path(cache_dir.name) / "verify.json"
+                cache_path.write_text(
+                    json.dumps({"/gone/file.txt": {"digest": "stale"}}),
+                    encoding="utf-8",
+                )
+                restore.verify_content(
+                    Path(source_dir),
+                    Path(target_dir),
+                    mode="full",
+                    sample_max_files=10,
+                    cache_path=cache_path,
+                )
+                cached = json.loads(cache_path.read_text(encoding="utf-8"))
+                self.assertEqual(
+                    sorted(cached),
+                    sorted([
+                        str(Path(source_dir, "file.txt")),
+                        str(Path(target_dir, "file.txt")),
+                    ]),
+                )
+                self.assertEqual(
+                    list(Path(cache_dir.name).iterdir()), [cache_path]
+                )
+                with mock.patch(
+                    "btrfs_to_s3.restore._hash_file"
+                ) as hash_file:
+                    restore.verify_content(
+                        Path(source_dir),
+                        Path(target_dir),
+                        mode="full",
+                        sample_max_files=10,
+                        cache_path=cache_path,
+                    )
+                hash_file.assert_not_called()
+
+    def test_cached_hash_file_rehashes_when_ctime_or_device_changes(
+        self,
+    ) -> None:
+        first = SimpleNamespace(
+            st_size=4, st_mtime_ns=1, st_ctime_ns=2, st_ino=3, st_dev=4
+        )
+        cache: dict[str, object] = {}
+        with mock.patch(
+            "btrfs_to_s3.restore._hash_file", return_value="digest"
+        ) as hash_file:
+            path = Path("/restore/file.txt")
+            restore._cached_hash_file(path, first, cache)
+            restore._cached_hash_file(path, first, cache)
+            self.assertEqual(hash_file.call_count, 1)
+            for changed in (
+                SimpleNamespace(**{**vars(first), "st_ctime_ns": 5}),
+                SimpleNamespace(**{**vars(first), "st_dev": 6}),
+            ):
+                restore._cached_hash_file(path, changed, cache)
+            self.assertEqual(hash_file.call_count, 3)
+
     def test_select_sample_is_deterministic(self) -> None:
         sample = restore._select_sample(["b", "a", "c"], 2)
         self.assertEqual(sample, ["a", "b"])
@@ -1005,6 +1473,30 @@ class RestoreVerifyTests(unittest.TestCase):
                 runner=runner,
             )
 
+    def test_verify_restore_same_tree_skips_content(self) -> None:
+        with tempfile.TemporaryDirectory() as target_dir:
+            target_path = Path(target_dir)
+
+            def runner(*args, **kwargs):
+                return subprocess.CompletedProcess(
+                    args[0],
+                    0,
+                    stdout="UUID: 11111111-2222-3333-4444-555555555555\n",
+                    stderr="",
+                )
+
+            with mock.patch(
+                "btrfs_to_s3.restore.verify_content"
+            ) as verify_content:
+                restore.verify_restore(
+                    target_path / ".",
+                    target_path,
+                    mode="full",
+                    sample_max_files=10,
+                    runner=runner,
+                )
+            verify_content.assert_not_called()
+
     def test_verify_restore_mode_none_skips_metadata(self) -> None:
         runner = mock.Mock()
         restore.verify_restore(
@@ -1016,9 +1508,92 @@ class RestoreVerifyTests(unittest.TestCase):
         )
         runner.assert_not_called()
 
+    def test_hash_file_matches_for_identical_content(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = Path(tmpdir, "first.bin")
+            second = Path(tmpdir, "second.bin")
+            payload = os.urandom(3 * 1024 + 5)
+            first.write_bytes(payload)
+            second.write_bytes(payload)
+            digest = restore._hash_file(first, chunk_size=1024)
+            self.assertEqual(digest, restore._hash_file(second))
+            second.write_bytes(payload[:-1] + b"x")
+            self.assertNotEqual(digest, restore._hash_file(second))
+
+    def test_hash_file_streams_large_files(self) -> None:
+        payload = os.urandom(restore.MMAP_HASH_THRESHOLD + 4097)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first = Path(temp_dir, "first.bin")
+            second = Path(temp_dir, "second.bin")
+            first.write_bytes(payload)
+            second.write_bytes(payload[:-1] + bytes([payload[-1] ^ 1]))
+            digest = restore._hash_file(first, chunk_size=64 * 1024)
+            expected = restore._new_file_hasher()
+            expected.update(payload)
+            self.assertEqual(digest, expected.hexdigest())
+            self.assertNotEqual(digest, restore._hash_file(second))
+
+    def test_scratch_buffer_is_reused_per_thread(self) -> None:
+        buffer = restore._scratch_buffer(1024)
+        self.assertIs(restore._scratch_buffer(1024), buffer)
+        self.assertEqual(len(restore._scratch_buffer(2048)), 2048)
+        others: list[memoryview] = []
+        worker = threading.Thread(
+            target=lambda: others.append(restore._scratch_buffer(2048))
+        )
+        worker.start()
+        worker.join()
+        self.assertIsNot(others[0], restore._scratch_buffer(2048))
+
+    def test_hash_file_reuses_resettable_hasher_per_thread(self) -> None:
+        hasher = mock.Mock()
+        hasher.hexdigest.return_value = "digest"
+        digests: list[str] = []
+
+        def hash_twice(path: Path) -> None:
+            digests.append(restore._hash_file(path))
+            digests.append(restore._hash_file(path))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir, "file.bin")
+            path.write_bytes(b"payload")
+            with mock.patch(
+                "btrfs_to_s3.restore._new_file_hasher", return_value=hasher
+            ) as new_hasher:
+                worker = threading.Thread(target=hash_twice, args=(path,))
+                worker.start()
+                worker.join()
+
+        self.assertEqual(digests, ["digest", "digest"])
+        new_hasher.assert_called_once_with()
+        hasher.reset.assert_called_once_with()
+
+    def test_hash_file_advises_sequential_then_dontneed(self) -> None:
+        if not hasattr(os, "posix_fadvise"):
+            self.skipTest("posix_fadvise unavailable")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "file.bin")
+            path.write_bytes(b"data")
+            with mock.patch(
+                "btrfs_to_s3.restore.os.posix_fadvise"
+            ) as fadvise:
+                restore._hash_file(path)
+        advice = [call.args[3] for call in fadvise.call_args_list]
+        self.assertEqual(
+            advice, [os.POSIX_FADV_SEQUENTIAL, os.POSIX_FADV_DONTNEED]
+        )
+
     def test_parse_uuid_missing_returns_none(self) -> None:
         self.assertIsNone(restore._parse_uuid("no uuid here"))
 
+    def test_parse_uuid_skips_parent_uuid(self) -> None:
+        value = "12345678-1234-5678-1234-567812345678"
+        output = (
+            "\tParent UUID: \t87654321-4321-8765-4321-876543218765\n"
+            f"\tUUID: \t{value}\n"
+        )
+        self.assertEqual(restore._parse_uuid(output), value)
+
 
 
 if __name__ == "__main__":
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import shlex
+import shutil
 import tempfile
 import unittest
 from datetime import datetime, timezone
@@ -10,15 +12,33 @@ from pathlib import Path
 from btrfs_to_s3.snapshots import SnapshotManager, snapshot_name
 
 
+_PRUNE_NAMES = (
+    "data__20260101T000000Z__full",
+    "data__20260108T000000Z__inc",
+    "data__20260115T000000Z__inc",
+)
+_EXPECTED_DELETED = frozenset({_PRUNE_NAMES[1]})
+
+
 class RecordingRunner:
     def __init__(self) -> None:
-        self.calls: list[list[str]] = []
+        self.calls: list[str] = []
 
     def run(self, args: list[str]) -> None:
-        self.calls.append(args)
+        self.calls.append(shlex.join(args))
 
 
 class SnapshotTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.temp_root = Path(tempfile.mkdtemp())
+        cls.addClassCleanup(shutil.rmtree, cls.temp_root, ignore_errors=True)
+
+    def _temp_dir(self) -> Path:
+        path = self.temp_root / self._testMethodName
+        path.mkdir()
+        return path
+
     def test_snapshot_name_deterministic(self) -> None:
         when = datetime(2026, 1, 1, 2, 3, 4, tzinfo=timezone.utc)
         self.assertEqual(
@@ -27,52 +47,48 @@ class SnapshotTests(unittest.TestCase):
         )
 
     def test_create_snapshot_records_command(self) -> None:
-        with tempfile.TemporaryDirectory() as temp_dir:
-            runner = RecordingRunner()
-            manager = SnapshotManager(
-                base_dir=Path(temp_dir),
-                runner=runner,
-                now=lambda: datetime(2026, 1, 1, tzinfo=timezone.utc),
-            )
-            snapshot = manager.create_snapshot(
-                Path("/srv/data/data"), "data", "full"
-            )
+        runner = RecordingRunner()
+        manager = SnapshotManager(
+            base_dir=self._temp_dir(),
+            runner=runner,
+            now=lambda: datetime(2026, 1, 1, tzinfo=timezone.utc),
+        )
+        snapshot = manager.create_snapshot(
+            Path("/srv/data/data"), "data", "full"
+        )
         self.assertEqual(snapshot.name, "data__20260101T000000Z__full")
         self.assertEqual(
             runner.calls,
             [
-                [
-                    "btrfs",
-                    "subvolume",
-                    "snapshot",
-                    "-r",
-                    "/srv/data/data",
-                    str(snapshot.path),
-                ]
+                "btrfs subvolume snapshot -r /srv/data/data "
+                + shlex.quote(str(snapshot.path))
             ],
         )
 
     def test_prune_retains_parent(self) -> None:
-        with tempfile.TemporaryDirectory() as temp_dir:
-            base_dir = Path(temp_dir)
-            names = [
-                "data__20260101T000000Z__full",
-                "data__20260108T000000Z__inc",
-                "data__20260115T000000Z__inc",
-            ]
-            for name in names:
-                (base_dir / name).mkdir()
-            runner = RecordingRunner()
-            manager = SnapshotManager(base_dir=base_dir, runner=runner)
-            deleted = manager.prune_snapshots(
-                "data", retain=1, keep_name=names[0]
-            )
-            deleted_names = {path.name for path in deleted}
-            self.assertEqual(deleted_names, {names[1]})
-            self.assertEqual(
-                runner.calls,
-                [["btrfs", "subvolume", "delete", str(base_dir / names[1])]],
-            )
+        base_dir = Path("/snapshots")
+        runner = RecordingRunner()
+        manager = SnapshotManager(
+            base_dir=base_dir,
+            runner=runner,
+            lister=lambda path: [path / name for name in _PRUNE_NAMES],
+        )
+        deleted = manager.prune_snapshots(
+            "data", retain=1, keep_name=_PRUNE_NAMES[0]
+        )
+        self.assertEqual(
+            frozenset(path.name for path in deleted), _EXPECTED_DELETED
+        )
+        self.assertEqual(
+            runner.calls,
+            [f"btrfs subvolume delete /snapshots/{_PRUNE_NAMES[1]}"],
+        )
+
+    def test_list_snapshots_missing_base_dir(self) -> None:
+        manager = SnapshotManager(
+            base_dir=self._temp_dir() / "missing", runner=RecordingRunner()
+        )
+        self.assertEqual(manager.list_snapshots("data"), [])
 
 
 if __name__ == "__main__":
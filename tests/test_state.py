@@ -2,14 +2,28 @@
 
 from __future__ import annotations
 
+import io
+import shutil
 import tempfile
 import unittest
 from pathlib import Path
 
-from btrfs_to_s3.state import State, SubvolumeState, load_state, save_state
+from btrfs_to_s3.state import (
+    State,
+    SubvolumeState,
+    load_state,
+    read_state,
+    save_state,
+    write_state,
+)
 
 
 class StateTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.temp_root = Path(tempfile.mkdtemp())
+        cls.addClassCleanup(shutil.rmtree, cls.temp_root, ignore_errors=True)
+
     def test_state_round_trip(self) -> None:
         state = State(
             subvolumes={
@@ -22,17 +36,25 @@ class StateTests(unittest.TestCase):
             },
             last_run_at="2026-01-02T00:00:00Z",
         )
-        with tempfile.TemporaryDirectory() as temp_dir:
-            path = Path(temp_dir) / "state.json"
-            save_state(path, state)
-            loaded = load_state(path)
-        self.assertEqual(loaded, state)
+        path = self.temp_root / self._testMethodName / "state.json"
+        save_state(path, state)
+        self.assertFalse(path.with_suffix(".tmp").exists())
+        self.assertEqual(load_state(path), state)
+
+    def test_state_stream_round_trip(self) -> None:
+        state = State(
+            subvolumes={"data": SubvolumeState(last_snapshot="snap-1")},
+            last_run_at="2026-01-02T00:00:00Z",
+        )
+        handle = io.StringIO()
+        write_state(handle, state)
+        handle.seek(0)
+        self.assertEqual(read_state(handle), state)
 
     def test_missing_state_returns_empty(self) -> None:
-        with tempfile.TemporaryDirectory() as temp_dir:
-            path = Path(temp_dir) / "missing.json"
-            state = load_state(path)
-            self.assertEqual(state, State())
+        path = self.temp_root / "missing.json"
+        state = load_state(path)
+        self.assertEqual(state, State())
 
 
 if __name__ == "__main__":
@@ -11,6 +11,9 @@ from unittest import mock
 from btrfs_to_s3.streamer import BtrfsSendProcess, StreamError, cleanup_btrfs_send, open_btrfs_send
 
 
+_STREAM_PAYLOAD = b"stream"
+
+
 class StreamerCleanupTests(unittest.TestCase):
     def test_cleanup_terminates_and_returns_stderr(self) -> None:
         class FakeProcess:
@@ -34,7 +37,7 @@ class StreamerCleanupTests(unittest.TestCase):
                 return b"", b"stderr output"
 
         process = FakeProcess()
-        stdout = io.BytesIO(b"stream")
+        stdout = io.BytesIO(_STREAM_PAYLOAD)
         error = cleanup_btrfs_send(process, stdout=stdout)
         self.assertTrue(stdout.closed)
         self.assertTrue(process.terminated)
@@ -47,7 +50,7 @@ class StreamerCleanupTests(unittest.TestCase):
                 self.terminated = False
                 self.killed = False
                 self._poll = None
-                self._calls = 0
+                self.timeouts: list[float | None] = []
 
             def poll(self):
                 return self._poll
@@ -60,22 +63,23 @@ class StreamerCleanupTests(unittest.TestCase):
                 self._poll = 0
 
             def communicate(self, timeout: float | None = None):
-                self._calls += 1
-                if self._calls == 1:
+                self.timeouts.append(timeout)
+                if len(self.timeouts) == 1:
                     raise subprocess.TimeoutExpired("btrfs send", 1.0)
                 return b"", b"forced stderr"
 
         process = FakeProcess()
-        stdout = io.BytesIO(b"stream")
+        stdout = io.BytesIO(_STREAM_PAYLOAD)
         error = cleanup_btrfs_send(process, stdout=stdout, timeout=0.01)
         self.assertTrue(process.terminated)
         self.assertTrue(process.killed)
         self.assertEqual(error, "forced stderr")
+        self.assertEqual(process.timeouts, [0.01, None])
 
 
 class StreamerOpenTests(unittest.TestCase):
     def test_open_btrfs_send_builds_incremental_args(self) -> None:
-        stdout = io.BytesIO(b"stream")
+        stdout = io.BytesIO(_STREAM_PAYLOAD)
         process = mock.Mock()
         process.stdout = stdout
         with mock.patch("btrfs_to_s3.streamer.subprocess.Popen") as popen:
@@ -2,198 +2,200 @@
 
 from __future__ import annotations
 
+import array
 import io
+import shutil
 import tempfile
 import unittest
+from concurrent.futures import Future
+from dataclasses import dataclass, fields, replace
 from unittest import mock
 from pathlib import Path
 
+from btrfs_to_s3 import uploader as uploader_mod
 from btrfs_to_s3.uploader import RetryPolicy, S3Uploader, UploadError
 
 
+_LARGE_PAYLOAD = bytes(5 * 1024 * 1024 + 1)
+_TEN_BYTES = bytes(10)
+_NO_SLEEP_POLICY = RetryPolicy(sleep=lambda _: None, jitter=lambda d: d)
+
+
+@dataclass(frozen=True)
+class _UploaderConfig:
+    bucket: str = "bucket"
+    storage_class: str = "STANDARD"
+    sse: str = "AES256"
+    retry_policy: RetryPolicy = _NO_SLEEP_POLICY
+
+
+_BASE_UPLOADER_CONFIG = _UploaderConfig()
+
+
+_PINNED_FIELDS = frozenset(field.name for field in fields(_UploaderConfig))
+
+
+def _uploader(client, **overrides) -> S3Uploader:
+    """Build an uploader; unpinned keywords keep S3Uploader's defaults."""
+    config = replace(
+        _BASE_UPLOADER_CONFIG,
+        **{
+            name: value
+            for name, value in overrides.items()
+            if name in _PINNED_FIELDS
+        },
+    )
+    passthrough = {
+        name: value
+        for name, value in overrides.items()
+        if name not in _PINNED_FIELDS
+    }
+    return S3Uploader(
+        client=client,
+        bucket=config.bucket,
+        storage_class=config.storage_class,
+        sse=config.sse,
+        retry_policy=config.retry_policy,
+        **passthrough,
+    )
+
+
+def _done_future(value) -> Future:
+    future: Future = Future()
+    future.set_result(value)
+    return future
+
+
 class FakeClient:
     def __init__(self, failures: int = 0) -> None:
         self.failures = failures
-        self.calls: list[tuple[str, dict]] = []
-        self.upload_calls = 0
+        self.upload_part_sizes = array.array("Q")
+        self.put_objects = 0
+        self.last_put_kwargs: dict | None = None
+        self.completed = False
+        self.aborted = False
 
     def create_multipart_upload(self, **kwargs):
-        self.calls.append(("create_multipart_upload", kwargs))
         return {"UploadId": "upload-1"}
 
     def upload_part(self, **kwargs):
-        self.calls.append(("upload_part", kwargs))
-        self.upload_calls += 1
+        body = kwargs["Body"]
+        if hasattr(body, "read"):
+            body = body.read()
+        self.upload_part_sizes.append(len(body))
         if self.failures > 0:
             self.failures -= 1
             raise RuntimeError("transient")
-        return {"ETag": f"etag-{self.upload_calls}"}
+        return {"ETag": f"etag-{len(self.upload_part_sizes)}"}
 
     def complete_multipart_upload(self, **kwargs):
-        self.calls.append(("complete_multipart_upload", kwargs))
+        self.completed = True
         return {}
 
     def abort_multipart_upload(self, **kwargs):
-        self.calls.append(("abort_multipart_upload", kwargs))
+        self.aborted = True
         return {}
 
     def put_object(self, **kwargs):
-        self.calls.append(("put_object", kwargs))
+        self.put_objects += 1
+        self.last_put_kwargs = kwargs
         return {"ETag": "etag-put"}
 
 
-class UploaderTests(unittest.TestCase):
-    def test_upload_stream_empty_uses_put_object(self) -> None:
-        class RecordingClient(FakeClient):
-            def __init__(self) -> None:
-                super().__init__()
-                self.payload = None
-
-            def put_object(self, **kwargs):
-                body = kwargs["Body"]
-                self.payload = body.read()
-                self.calls.append(("put_object", kwargs))
-                return {"ETag": "etag-put"}
+class RecordingClient(FakeClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.payload = None
 
-        client = RecordingClient()
-        uploader = S3Uploader(
-            client=client,
-            bucket="bucket",
-            storage_class="STANDARD",
-            sse="AES256",
-            multipart_threshold=50,
-            retry_policy=RetryPolicy(sleep=lambda _: None, jitter=lambda d: d),
-        )
-        result = uploader.upload_stream("key", io.BytesIO(b""))
-        self.assertEqual(result.size, 0)
-        self.assertEqual(client.payload, b"")
-        self.assertTrue(any(call[0] == "put_object" for call in client.calls))
+    def put_object(self, **kwargs):
+        self.payload = kwargs["Body"].read()
+        self.put_objects += 1
+        return {"ETag": "etag-put"}
 
-    def test_upload_stream_small_uses_put_object(self) -> None:
-        class RecordingClient(FakeClient):
-            def __init__(self) -> None:
-                super().__init__()
-                self.payload = None
 
-            def put_object(self, **kwargs):
-                body = kwargs["Body"]
-                self.payload = body.read()
-                self.calls.append(("put_object", kwargs))
-                return {"ETag": "etag-put"}
+class UploaderTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.temp_root = Path(tempfile.mkdtemp())
+        cls.addClassCleanup(shutil.rmtree, cls.temp_root, ignore_errors=True)
 
-        client = RecordingClient()
-        uploader = S3Uploader(
-            client=client,
-            bucket="bucket",
-            storage_class="STANDARD",
-            sse="AES256",
-            multipart_threshold=50,
-            retry_policy=RetryPolicy(sleep=lambda _: None, jitter=lambda d: d),
-        )
-        payload = b"small-payload"
-        result = uploader.upload_stream("key", io.BytesIO(payload))
-        self.assertEqual(result.size, len(payload))
-        self.assertEqual(client.payload, payload)
-        self.assertTrue(any(call[0] == "put_object" for call in client.calls))
+    def _temp_dir(self) -> Path:
+        path = self.temp_root / self._testMethodName
+        path.mkdir()
+        return path
+
+    def test_upload_stream_small_uses_put_object(self) -> None:
+        for payload in (b"", b"small-payload"):
+            with self.subTest(size=len(payload)):
+                client = RecordingClient()
+                uploader = _uploader(client, multipart_threshold=50)
+                result = uploader.upload_stream("key", io.BytesIO(payload))
+                self.assertEqual(result.size, len(payload))
+                self.assertEqual(client.payload, payload)
+                self.assertEqual(client.put_objects, 1)
 
     def test_upload_stream_large_uses_multipart(self) -> None:
         client = FakeClient()
-        payload = b"a" * (5 * 1024 * 1024 + 1)
-        uploader = S3Uploader(
-            client=client,
-            bucket="bucket",
-            storage_class="STANDARD",
-            sse="AES256",
+        uploader = _uploader(
+            client,
             part_size=5 * 1024 * 1024,
             multipart_threshold=5 * 1024 * 1024,
-            retry_policy=RetryPolicy(sleep=lambda _: None, jitter=lambda d: d),
         )
-        result = uploader.upload_stream("key", io.BytesIO(payload))
-        self.assertEqual(result.size, len(payload))
-        upload_calls = [call for call in client.calls if call[0] == "upload_part"]
-        sizes = [len(call[1]["Body"]) for call in upload_calls]
-        self.assertEqual(sizes, [5 * 1024 * 1024, 1])
+        result = uploader.upload_stream("key", io.BytesIO(_LARGE_PAYLOAD))
+        self.assertEqual(result.size, len(_LARGE_PAYLOAD))
+        self.assertEqual(
+            list(client.upload_part_sizes), [5 * 1024 * 1024, 1]
+        )
 
     def test_spooled_parts_require_dir(self) -> None:
-        uploader = S3Uploader(
-            client=FakeClient(),
-            bucket="bucket",
-            storage_class="STANDARD",
-            sse="AES256",
-            retry_policy=RetryPolicy(sleep=lambda _: None, jitter=lambda d: d),
-        )
+        uploader = _uploader(FakeClient())
         with self.assertRaises(UploadError):
             next(uploader._iter_spooled_parts(io.BytesIO(b""), b"", 5, None))
 
     def test_spool_limits_in_flight_parts(self) -> None:
-        uploader = S3Uploader(
-            client=FakeClient(),
-            bucket="bucket",
-            storage_class="STANDARD",
-            sse="AES256",
+        uploader = _uploader(
+            FakeClient(),
             concurrency=4,
             spool_dir=Path("spool"),
             spool_size_bytes=9,
-            retry_policy=RetryPolicy(sleep=lambda _: None, jitter=lambda d: d),
         )
         self.assertEqual(uploader._max_in_flight_parts(5, use_spool=True), 1)
 
     def test_multipart_retries_then_succeeds(self) -> None:
         client = FakeClient(failures=2)
-        policy = RetryPolicy(max_attempts=5, sleep=lambda _: None, jitter=lambda d: d)
-        uploader = S3Uploader(
-            client=client,
-            bucket="bucket",
-            storage_class="STANDARD",
-            sse="AES256",
+        policy = replace(_NO_SLEEP_POLICY, max_attempts=5)
+        uploader = _uploader(
+            client,
             part_size=4,
             multipart_threshold=5,
             retry_policy=policy,
         )
-        result = uploader.upload_bytes("key", b"abcdefghij")
+        result = uploader.upload_bytes("key", _TEN_BYTES)
         self.assertEqual(result.size, 10)
-        upload_calls = [call for call in client.calls if call[0] == "upload_part"]
-        self.assertEqual(len(upload_calls), 5)
-        self.assertTrue(
-            any(call[0] == "complete_multipart_upload" for call in client.calls)
-        )
-        self.assertFalse(
-            any(call[0] == "abort_multipart_upload" for call in client.calls)
-        )
+        self.assertEqual(len(client.upload_part_sizes), 5)
+        self.assertTrue(client.completed)
+        self.assertFalse(client.aborted)
 
     def test_multipart_aborts_on_exhaustion(self) -> None:
         client = FakeClient(failures=10)
-        policy = RetryPolicy(max_attempts=2, sleep=lambda _: None, jitter=lambda d: d)
-        uploader = S3Uploader(
-            client=client,
-            bucket="bucket",
-            storage_class="STANDARD",
-            sse="AES256",
+        policy = replace(_NO_SLEEP_POLICY, max_attempts=2)
+        uploader = _uploader(
+            client,
             part_size=4,
             multipart_threshold=5,
             retry_policy=policy,
         )
         with self.assertRaises(UploadError):
-            uploader.upload_bytes("key", b"abcdefghij")
-        self.assertTrue(
-            any(call[0] == "abort_multipart_upload" for call in client.calls)
-        )
+            uploader.upload_bytes("key", _TEN_BYTES)
+        self.assertTrue(client.aborted)
 
     def test_put_object_uses_sse(self) -> None:
         client = FakeClient()
         created: dict[str, int] = {}
-        uploader = S3Uploader(
-            client=client,
-            bucket="bucket",
-            storage_class="STANDARD",
-            sse="AES256",
-            multipart_threshold=50,
-            retry_policy=RetryPolicy(sleep=lambda _: None, jitter=lambda d: d),
-        )
+        uploader = _uploader(client, multipart_threshold=50)
         uploader.upload_bytes("key", b"small")
-        put_calls = [call for call in client.calls if call[0] == "put_object"]
-        self.assertEqual(len(put_calls), 1)
-        args = put_calls[0][1]
+        self.assertEqual(client.put_objects, 1)
+        args = client.last_put_kwargs
         self.assertEqual(args["ServerSideEncryption"], "AES256")
         self.assertEqual(args["StorageClass"], "STANDARD")
 
@@ -208,24 +210,8 @@ class UploaderTests(unittest.TestCase):
             def seekable(self) -> bool:
                 return False
 
-        class RecordingClient:
-            def __init__(self) -> None:
-                self.payload = None
-
-            def put_object(self, **kwargs):
-                body = kwargs["Body"]
-                self.payload = body.read()
-                return {"ETag": "etag"}
-
         client = RecordingClient()
-        uploader = S3Uploader(
-            client=client,
-            bucket="bucket",
-            storage_class="STANDARD",
-            sse="AES256",
-            multipart_threshold=50,
-            retry_policy=RetryPolicy(sleep=lambda _: None, jitter=lambda d: d),
-        )
+        uploader = _uploader(client, multipart_threshold=50)
         payload = b"non-seekable"
         result = uploader._put_object_stream(
             "key", NonSeekableStream(payload)
@@ -235,89 +221,47 @@ class UploaderTests(unittest.TestCase):
 
     def test_multipart_part_size_is_capped(self) -> None:
         client = FakeClient()
-        policy = RetryPolicy(max_attempts=2, sleep=lambda _: None, jitter=lambda d: d)
-        with mock.patch("btrfs_to_s3.uploader.MAX_PART_SIZE", 5):
-            uploader = S3Uploader(
-                client=client,
-                bucket="bucket",
-                storage_class="STANDARD",
-                sse="AES256",
+        policy = replace(_NO_SLEEP_POLICY, max_attempts=2)
+        with mock.patch.object(uploader_mod, "MAX_PART_SIZE", 5):
+            uploader = _uploader(
+                client,
                 part_size=10,
                 multipart_threshold=1,
                 retry_policy=policy,
             )
-            uploader.upload_bytes("key", b"abcdefghij")
-        upload_calls = [call for call in client.calls if call[0] == "upload_part"]
-        sizes = [len(call[1]["Body"]) for call in upload_calls]
-        self.assertEqual(sizes, [5, 5])
+            uploader.upload_bytes("key", _TEN_BYTES)
+        self.assertEqual(list(client.upload_part_sizes), [5, 5])
 
     def test_concurrency_setting_is_used(self) -> None:
         client = FakeClient()
-        created: dict[str, int] = {}
-
-        class FakeFuture:
-            def __init__(self, value: str) -> None:
-                self._value = value
-
-            def result(self) -> str:
-                return self._value
-
-        class FakeExecutor:
-            created: dict[str, int] = {}
-
-            def __init__(self, max_workers: int) -> None:
-                self.created["max_workers"] = max_workers
-
-            def __enter__(self):
-                return self
-
-            def __exit__(self, exc_type, exc, tb) -> None:
-                return None
-
-            def submit(self, fn, *args, **kwargs):
-                return FakeFuture(fn(*args, **kwargs))
-
-        FakeExecutor.created = created
-
-        def fake_wait(futures, return_when=None):
-            return set(futures), set()
-
-        with mock.patch(
-            "btrfs_to_s3.uploader.ThreadPoolExecutor", FakeExecutor
-        ), mock.patch(
-            "btrfs_to_s3.uploader.wait", side_effect=fake_wait
-        ):
-            uploader = S3Uploader(
-                client=client,
-                bucket="bucket",
-                storage_class="STANDARD",
-                sse="AES256",
+        with mock.patch.object(uploader_mod, "ThreadPoolExecutor") as executor:
+            executor.return_value.__enter__.return_value.submit.side_effect = (
+                lambda fn, *args, **kwargs: _done_future(fn(*args, **kwargs))
+            )
+            uploader = _uploader(
+                client,
                 part_size=4,
                 multipart_threshold=5,
                 concurrency=3,
-                retry_policy=RetryPolicy(sleep=lambda _: None, jitter=lambda d: d),
             )
-            uploader.upload_bytes("key", b"abcdefghij")
-            self.assertEqual(FakeExecutor.created.get("max_workers"), 3)
+            uploader.upload_bytes("key", _TEN_BYTES)
+        self.assertEqual(executor.call_args.kwargs["max_workers"], 3)
+        self.assertEqual(list(client.upload_part_sizes), [4, 4, 2])
 
     def test_spool_cleans_up_files(self) -> None:
         client = FakeClient()
-        with tempfile.TemporaryDirectory() as temp_dir:
-            spool_dir = Path(temp_dir)
-            uploader = S3Uploader(
-                client=client,
-                bucket="bucket",
-                storage_class="STANDARD",
-                sse="AES256",
-                part_size=5 * 1024 * 1024,
-                multipart_threshold=5,
-                concurrency=2,
-                spool_dir=spool_dir,
-                spool_size_bytes=8 * 1024 * 1024,
-                retry_policy=RetryPolicy(sleep=lambda _: None, jitter=lambda d: d),
-            )
-            uploader.upload_bytes("key", b"abcdefghij")
-            self.assertEqual(list(spool_dir.iterdir()), [])
+        spool_dir = self._temp_dir()
+        uploader = _uploader(
+            client,
+            part_size=5 * 1024 * 1024,
+            multipart_threshold=5,
+            concurrency=2,
+            spool_dir=spool_dir,
+            spool_size_bytes=8 * 1024 * 1024,
+        )
+        uploader.upload_bytes("key", _TEN_BYTES)
+        self.assertEqual(list(client.upload_part_sizes), [10])
+        self.assertEqual(list(spool_dir.iterdir()), [])
 
 
 if __name__ == "__main__":